@@ -1,33 +1,296 @@
 """
     Table class module to allow standard interfacing with Athena tables
 """
+import csv
 import datetime
+import functools
+import itertools
 import os
 import pathlib
+import re
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 import dateutil
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+import numpy
 import pandas
+# pandas already imports pyarrow and pyarrow.compute, so these only add the
+# csv/fs/parquet readers (~40ms), far less than the boto3 clients made lazy below
+import pyarrow
+import pyarrow.compute
+import pyarrow.csv
+import pyarrow.fs
+import pyarrow.parquet
+from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql.schema import Table, MetaData
 
 
-_s3 = boto3.client(service_name="s3", region_name="us-east-1")
-_glue = boto3.client(service_name="glue", region_name="us-east-1")
-_athena = boto3.client(service_name="athena", region_name="us-east-1")
 _ALLOWED_LOCATIONS = ("my_folder", "my_another_folder")
 _DEFAULT_BUCKET = "my_default_bucket"
 _home = os.path.expanduser("~")
-_today = datetime.date.today().isoformat().replace("-", "/")
-_yesterday = (
-    (datetime.date.today() + dateutil.relativedelta.relativedelta(days=-1))
-    .isoformat()
-    .replace("-", "/")
-)
-_lastmonth = (
-    (datetime.date.today() + dateutil.relativedelta.relativedelta(months=-1))
-    .isoformat()
-    .replace("-", "/")
+_ZFILL_WIDTHS = {
+    "zip_cd": 5,
+    "cbsa_cd": 5,
+    "cnty_cd": 3,
+    "sale_regn_cd": 2,
+    "prim_msa_cd": 4,
+    "customer_id": 10,
+    "_cust_id": 10,
+}
+_ZFILL_RE = re.compile(
+    r"(zip_cd|cbsa_cd|cnty_cd|sale_regn_cd|prim_msa_cd|prim_census_tract_cd"
+    r"|customer_id|_cust_id|lnprps_cd|uw_desgntn_cd)"
 )
+_DATETIME_SUFFIXES = ("date", "_dt", "_ts", "_date_time", "_timestamp")
+_DATETIME_FORMAT = "ISO8601"
+_DELETE_BATCH_SIZE = 1000
+_COPY_WORKERS = 32
+_GLUE_TTL = 30
+_CSV_BLOCK_SIZE = 64 << 20
+_GLUE_TYPE_NAME_RE = re.compile(r"[a-z0-9_]+")
+_ARROW_TYPES = {
+    "string": pyarrow.string(),
+    "varchar": pyarrow.string(),
+    "char": pyarrow.string(),
+    "boolean": pyarrow.bool_(),
+    "tinyint": pyarrow.int8(),
+    "smallint": pyarrow.int16(),
+    "int": pyarrow.int32(),
+    "integer": pyarrow.int32(),
+    "bigint": pyarrow.int64(),
+    "float": pyarrow.float32(),
+    "double": pyarrow.float64(),
+    "date": pyarrow.date32(),
+    "timestamp": pyarrow.timestamp("ms"),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _s3():
+    return boto3.client(
+        service_name="s3",
+        region_name="us-east-1",
+        config=Config(max_pool_connections=_COPY_WORKERS),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _glue():
+    return boto3.client(service_name="glue", region_name="us-east-1")
+
+
+@functools.lru_cache(maxsize=1)
+def _athena():
+    return boto3.client(service_name="athena", region_name="us-east-1")
+
+
+@functools.lru_cache(maxsize=1)
+def _arrow_s3():
+    return pyarrow.fs.S3FileSystem(region="us-east-1")
+
+
+def _today():
+    return datetime.date.today().isoformat().replace("-", "/")
+
+
+def _yesterday():
+    return (
+        (datetime.date.today() + dateutil.relativedelta.relativedelta(days=-1))
+        .isoformat()
+        .replace("-", "/")
+    )
+
+
+def _lastmonth():
+    return (
+        (datetime.date.today() + dateutil.relativedelta.relativedelta(months=-1))
+        .isoformat()
+        .replace("-", "/")
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _athena_engine():
+    """
+    This function builds the athena SQLAlchemy engine once and shares it,
+    so every table operation reuses the same connection pool
+
+    The schema and query staging dir must be set in ATHENA_SCHEMA_NAME and
+    ATHENA_S3_STAGING_DIR; there are no defaults, so DDL never lands in a guessed schema.
+    """
+    missing = [
+        _ for _ in ("ATHENA_SCHEMA_NAME", "ATHENA_S3_STAGING_DIR") if not os.environ.get(_)
+    ]
+    if missing:
+        raise RuntimeError(
+            f"Cannot build the athena engine, set the environment variables: {', '.join(missing)}"
+        )
+    schema = os.environ["ATHENA_SCHEMA_NAME"]
+    staging_dir = urllib.parse.quote_plus(os.environ["ATHENA_S3_STAGING_DIR"])
+    return create_engine(
+        f"awsathena+rest://@athena.us-east-1.amazonaws.com:443/{schema}"
+        f"?s3_staging_dir={staging_dir}"
+    )
+
+
+def _cast_datetime(frame, col, fmt):
+    """
+    This function parses a column in one fixed-format pass, which for ISO8601 covers dates,
+    space or 'T' separators and fractional seconds; only a column holding non-ISO values
+    is re-parsed with pandas' own inference, which still raises on unparseable values
+    """
+    try:
+        frame[col] = pandas.to_datetime(frame[col], format=fmt, cache=True)
+    except ValueError:
+        frame[col] = pandas.to_datetime(frame[col], cache=True)
+
+
+def _lpad_zeros(values, width):
+    """
+    This function left pads values with zeros to width using Arrow's string kernels,
+    returning an Arrow backed string array
+    """
+    strings = pyarrow.array(values.astype("string[pyarrow]"))
+    return pandas.arrays.ArrowStringArray(
+        pyarrow.compute.ascii_lpad(strings, width=width, padding="0")
+    )
+
+
+def _cast_zfill(frame, col, width):
+    frame[col] = _lpad_zeros(frame[col], width)
+
+
+def _cast_census_tract(frame, col, width):
+    """
+    This function turns decimal tract codes into zero padded strings,
+    multiplying by 100 before the integer cast so the decimal digits are kept
+
+    >>> frame = pandas.DataFrame({"prim_census_tract_cd": [9501.02, 12.0, None]})
+    >>> _cast_census_tract(frame, "prim_census_tract_cd", 6)
+    >>> frame["prim_census_tract_cd"].tolist()
+    ['950102', '001200', <NA>]
+    """
+    tract = pandas.to_numeric(frame[col]).mul(100).round().astype("Int64")
+    frame[col] = _lpad_zeros(tract, width)
+
+
+def _cast_unk_zfill(frame, col, width):
+    unk_cd = frame[col].astype("string")
+    is_unk = unk_cd.eq("UNK").fillna(False)
+    frame[col] = pandas.Series(
+        numpy.where(is_unk, unk_cd, unk_cd.str.zfill(width)),
+        index=frame.index,
+        dtype="string",
+    )
+
+
+def _delete_keys(bucket, keys):
+    """
+    This function deletes keys from a bucket in batches of _DELETE_BATCH_SIZE,
+    retrying one at a time any key that the batch call reports as failed
+    """
+    keys = iter(keys)
+    while True:
+        batch = [{"Key": _} for _ in itertools.islice(keys, _DELETE_BATCH_SIZE)]
+        if not batch:
+            break
+        response = _s3().delete_objects(
+            Bucket=bucket, Delete={"Objects": batch, "Quiet": True}
+        )
+        for error in response.get("Errors", []):
+            _s3().delete_object(Bucket=bucket, Key=error["Key"])
+
+
+def _classify_column(col):
+    """
+    This function returns the (action, arg) pair cast_dataframe applies to a column,
+    action is None for columns that only need their glue type cast
+    """
+    if col.endswith(_DATETIME_SUFFIXES):
+        return _cast_datetime, _DATETIME_FORMAT
+    match = _ZFILL_RE.search(col)
+    if match is None:
+        return None, None
+    code = match.group(1)
+    if code == "prim_census_tract_cd":
+        return _cast_census_tract, 6
+    if code in ("lnprps_cd", "uw_desgntn_cd"):
+        return _cast_unk_zfill, 2
+    return _cast_zfill, _ZFILL_WIDTHS[code]
+
+
+def _glue_to_arrow(glue_type):
+    """
+    This function maps a Glue/Presto column type to the matching pyarrow type,
+    including nested array/map/struct types, falling back to string for scalar
+    types without a direct equivalent
+    """
+    arrow_type, _ = _parse_glue_type(glue_type.lower().replace(" ", ""), 0)
+    return arrow_type
+
+
+def _parse_glue_type(text, pos):
+    """
+    This function parses the Glue type starting at pos and returns it as a pyarrow
+    type together with the position right after it
+    """
+    name = _GLUE_TYPE_NAME_RE.match(text, pos).group()
+    pos += len(name)
+    if name == "array":
+        item, pos = _parse_glue_type(text, pos + 1)
+        return pyarrow.list_(item), pos + 1
+    if name == "map":
+        key, pos = _parse_glue_type(text, pos + 1)
+        value, pos = _parse_glue_type(text, pos + 1)
+        return pyarrow.map_(key, value), pos + 1
+    if name == "struct":
+        fields = []
+        while text[pos] != ">":
+            colon = text.index(":", pos)
+            field_name = text[pos + 1 : colon]
+            field_type, pos = _parse_glue_type(text, colon + 1)
+            fields.append((field_name, field_type))
+        return pyarrow.struct(fields), pos + 1
+    args = []
+    if text[pos : pos + 1] == "(":
+        close = text.index(")", pos)
+        args = [int(_) for _ in text[pos + 1 : close].split(",")]
+        pos = close + 1
+    if name == "decimal":
+        precision, scale = (args + [10, 0][len(args) :])[:2]
+        return pyarrow.decimal128(precision, scale), pos
+    return _ARROW_TYPES.get(name, pyarrow.string()), pos
+
+
+def _to_arrow_table(frame, schema):
+    """
+    This function converts a cast frame to an Arrow table with the glue schema,
+    truncating timestamps to milliseconds first, as to_parquet's
+    allow_truncated_timestamps did, instead of failing on sub-millisecond values
+    """
+    for field in schema:
+        if pyarrow.types.is_timestamp(field.type) and field.name in frame.columns:
+            if pandas.api.types.is_datetime64_any_dtype(frame[field.name]):
+                frame[field.name] = frame[field.name].dt.floor("ms")
+    return pyarrow.Table.from_pandas(frame, schema=schema, preserve_index=False)
+
+
+def _cast_columns(frame, plan):
+    """
+    This function applies a cast plan, as built by set_glue_dictionary, to a frame
+    """
+    columns = frame.columns
+    for col, action, arg, col_type in plan:
+        if col in columns:
+            if action is not None:
+                action(frame, col, arg)
+            frame[col] = cast_series_type(frame[col], col_type)
+    return frame
 
 class AthenaTable:
     """
@@ -41,54 +304,84 @@ class AthenaTable:
 	    self.source_path = None
 	    self.table_bucket = _DEFAULT_BUCKET
 	    self.glue_definition = field(default_factory=dict)
-	    self.table_type = PrestoTableType.UNKNOWN
+	    self.presto_table_type = PrestoTableType.UNKNOWN
+	    self._cast_plan = []
+	    self._glue_fetched_at = None
+	    self._arrow_schema = None
+	    self._location = None
+	    self._columns_raw = []
+	    self._bucket = None
+	    self._prefix = None
    
+    def set_glue_dictionary(self, force=False) -> None:
+        """
+        This method fetches the glue definition of the table and builds its cast plan
+
+        The cast plan classifies every column once, so cast_dataframe does not
+        re-evaluate the column name checks for every frame it casts.
+        A definition fetched less than _GLUE_TTL seconds ago is reused unless force is set.
+        """
+        if (
+            not force
+            and self.glue_definition
+            and self._glue_fetched_at is not None
+            and time.monotonic() - self._glue_fetched_at < _GLUE_TTL
+        ):
+            return
+        try:
+            self.glue_definition = _glue().get_table(
+                DatabaseName=self.table_schema, Name=self.table_name
+            )
+        except _glue().exceptions.EntityNotFoundException:
+            self.glue_definition = dict()
+        self.presto_table_type = PrestoTableType.UNKNOWN
+        if self.glue_definition:
+            self.presto_table_type = PrestoTableType.__members__.get(
+                self.glue_definition["Table"].get("TableType"), PrestoTableType.UNKNOWN
+            )
+        self._glue_fetched_at = time.monotonic()
+        self._cast_plan = []
+        self._arrow_schema = None
+        self._location, self._columns_raw = None, []
+        self._bucket, self._prefix = None, None
+        if self.glue_definition:
+            storage = self.glue_definition["Table"]["StorageDescriptor"]
+            self._location = storage.get("Location")
+            self._columns_raw = storage["Columns"]
+            path = (self._location or "").split("//", 1)[-1]
+            if self.presto_table_type != PrestoTableType.VIRTUAL_VIEW and "/" in path:
+                self._bucket, self._prefix = path.split("/", 1)
+            for column in self._columns_raw:
+                action, arg = _classify_column(column["Name"])
+                self._cast_plan.append((column["Name"], action, arg, column["Type"]))
+            self._arrow_schema = pyarrow.schema(
+                [(_["Name"], _glue_to_arrow(_["Type"])) for _ in self._columns_raw]
+            )
+
+    def mgic_athena_engine(self):
+        """
+        This method returns the athena SQLAlchemy engine shared by all tables
+        """
+        return _athena_engine()
+
+    @property
+    def csv_column_types(self):
+        """
+        This property gives the type pyarrow should parse each column as when reading csv,
+        the glue type, or string for the columns the cast plan still rewrites and for
+        nested types csv cannot hold, so a streaming reader never guesses a type
+        that a later block contradicts
+        """
+        ans = {}
+        for col, action, _, col_type in self._cast_plan:
+            arrow_type = _glue_to_arrow(col_type)
+            if action is not None or pyarrow.types.is_nested(arrow_type):
+                arrow_type = pyarrow.string()
+            ans[col] = arrow_type
+        return ans
+
     def cast_dataframe(self, frame):
-        for column in self.glue_definition["Table"]["StorageDescriptor"]["Columns"]:
-            if column["Name"] in frame.columns:
-                col = column["Name"]
-                if (
-                    col.endswith("date")
-                    or col.endswith("_dt")
-                    or col.endswith("_ts")
-                    or col.endswith("_date_time")
-                    or col.endswith("_timestamp")
-                ):
-                    frame[col] = pandas.to_datetime(frame[col])
-                if col.__contains__("zip_cd") or col.__contains__("cbsa_cd"):
-                    frame[col] = frame[col].apply(
-                        lambda geo_cd: zfill(geo_cd, 5)
-                    )
-                if col.__contains__("cnty_cd"):
-                    frame[col] = frame[col].apply(
-                        lambda geo_cd: zfill(geo_cd, 3)
-                    )
-                if col.__contains__("sale_regn_cd"):
-                    frame[col] = frame[col].apply(
-                        lambda geo_cd: zfill(geo_cd, 2)
-                    )
-                if col.__contains__("prim_msa_cd"):
-                    frame[col] = frame[col].apply(
-                        lambda geo_cd: zfill(geo_cd, 4)
-                    )
-                if col.__contains__("prim_census_tract_cd"):
-                    frame[col] = frame[col].apply(
-                        lambda geo_cd: zfill(100 * geo_cd, 6)
-                    )
-                if col.__contains__("customer_id") or col.__contains__("_cust_id"):
-                    frame[col] = frame[col].apply(
-                        lambda customer_id: zfill(customer_id, 10)
-                    )
-                if col.__contains__("lnprps_cd") or col.__contains__("uw_desgntn_cd"):
-                    frame[col] = frame[col].apply(
-                        lambda unk_cd: unk_cd
-                        if unk_cd == "UNK"
-                        else zfill(unk_cd, 2)
-                    )
-                frame[column["Name"]] = cast_series_type(
-                    frame[column["Name"]], column["Type"]
-                )
-        return frame
+        return _cast_columns(frame, self._cast_plan)
 
 
     def repair(self) -> None:
@@ -104,7 +397,7 @@ class AthenaTable:
         assert self.presto_table_type not in (
             PrestoTableType["VIRTUAL_VIEW"],
         ), "You are trying to repair a non-defined TABLE!"
-        with self.mgic_athena_engine().connect() as conn:
+        with self.mgic_athena_engine().begin() as conn:
             conn.execute(f"MSCK REPAIR TABLE {self.table_schema}.{self.table_name};")
 
     def drop(self) -> None:
@@ -123,27 +416,35 @@ class AthenaTable:
             )
             sa_table.drop()
             self.glue_definition = dict()
+            self.presto_table_type = PrestoTableType.UNKNOWN
+
+    def iter_objects(self):
+        """
+        This method yields the s3 paths of all the parquet files supporting the table,
+        following the list_objects_v2 continuation tokens page by page
+
+        Views, unknown tables and locations without a prefix have no _prefix and yield nothing,
+        rather than listing a whole bucket.
+        """
+        if self.presto_table_type == PrestoTableType.VIRTUAL_VIEW:
+            return
+        self.set_glue_dictionary()
+        if self._prefix is None:
+            return
+        paginator = _s3().get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=self._bucket,
+            Prefix=self._prefix,
+            PaginationConfig={"PageSize": 1000},
+        ):
+            for _ in page.get("Contents", []):
+                yield _["Key"]
 
     def list_objects(self):
         """
         This method returns a list of s3 paths of all the parquet files supporting the table
         """
-        ans = []
-        self.set_glue_dictionary()
-        if self.presto_table_type in [
-            PrestoTableType.VIRTUAL_VIEW,
-            PrestoTableType.UNKNOWN,
-        ]:
-            ans = []
-        else:
-            location = self.glue_definition["Table"]["StorageDescriptor"]["Location"]
-            bucket, prefix = location.split("//")[-1].split("/", 1)
-            objects = s3_list_objects(Bucket=bucket, Prefix=prefix)
-            if "Contents" in objects.keys():
-                ans = [_["Key"] for _ in objects["Contents"]]
-            else:
-                pass
-        return ans
+        return list(self.iter_objects())
 
     
     def empty(self) -> None:
@@ -152,7 +453,7 @@ class AthenaTable:
 
         It gets the table information using glue.  It checks that the table access allows for emptying.
         It finds all the files to delete and deletes them.
-        Finally, it updates the glue_definition, and repairs the table.
+        Finally, it repairs the table, reusing the glue_definition since deleting objects does not change it.
         """
         self.set_glue_dictionary()
         assert (
@@ -161,9 +462,7 @@ class AthenaTable:
         print(
             f"EMPTYING: {self.table_schema}.{self.table_name} AT {self.s3_root}/{self.s3_table_path} !"
         )
-        for _ in self.list_objects():
-            _s3.delete_object(Bucket=f"{self.table_bucket}", Key=_)
-        self.set_glue_dictionary()
+        _delete_keys(self.table_bucket, self.iter_objects())
         self.repair()
 
     def purge(self) -> None:
@@ -176,61 +475,42 @@ class AthenaTable:
             self.drop()
 
 
-    def populate_from_source(self, ymd=_today, files_are_parquet=True):
+    def populate_from_source(self, ymd=None, files_are_parquet=True):
         """
         This method populates a table by copying that data from the source (specified at the table's definition)
         """
+        if ymd is None:
+            ymd = _today()
         self.set_glue_dictionary()
         if self.source_type in {SourceType.HTTP}:
-            data_frame = pandas.read_csv(self.source_path)
-            data_frame.columns = [_.lower() for _ in data_frame.columns]
+            data_frame = self._read_http_source().to_pandas(
+                types_mapper=pandas.ArrowDtype
+            )
             data_frame = self.castframe(data_frame)
-            data_frame.to_parquet(
-                f"{self.glue_definition['Table']['StorageDescriptor']['Location']}/bulk.parquet",
-                coerce_timestamps="ms",
-                allow_truncated_timestamps=True,
+            pyarrow.parquet.write_table(
+                _to_arrow_table(data_frame, self._arrow_schema),
+                f"{self._location}/bulk.parquet",
+                compression="snappy",
             )
-            self.set_glue_dictionary()
+            self.set_glue_dictionary(force=True)
         elif self.source_type == SourceType.PRODUCTION:
-            files = [_ for _ in self.listen(files_are_parquet) if _.__contains__(ymd)]
+            files = [_ for _ in self.listen(files_are_parquet) if ymd in _]
             if files:
                 self.empty()
-                for _file in files:
-                    source_bucket = "my-prod-bucket"
-                    _s3.copy(
-                        {"Bucket": source_bucket, "Key": _file},
-                        Bucket=self.table_bucket,
-                        Key=f"{self.s3_root}/{self.table_schema}/{self.table_name}/{_file.split('/',1)[-1]}",
-                    )
+                self._copy_from("my-prod-bucket", files)
         elif self.source_type in {SourceType.INCOMING, SourceType.LEGACY}:
             files = self.listen()
             if files:
                 self.empty()
-                for _file in files:
-                    source_bucket = "DONOTDELETEME"
-                    if self.source_type == SourceType.INCOMING:
-                        source_bucket = _DEFAULT_BUCKET
-                        _s3.copy(
-                            {"Bucket": source_bucket, "Key": _file},
-                            Bucket=self.table_bucket,
-                            Key=f"{self.s3_root}/{self.table_schema}/{self.table_name}/{_file.split('/',1)[-1]}",
-                        )
-                    elif self.source_type == SourceType.LEGACY:
-                        source_bucket = "legacy-raw-data-qa"
-                        if _current_file(_file):
-                            _s3.copy(
-                                {"Bucket": source_bucket, "Key": _file},
-                                Bucket=self.table_bucket,
-                                Key=f"{self.s3_root}/{self.table_schema}/{self.table_name}/{_file.split('/',1)[-1]}",
-                            )
-                        else:
-                            pass
-                    else:
-                        pass
-                    if source_bucket == _DEFAULT_BUCKET:
-                        _s3.delete_object(Bucket=f"{self.table_bucket}", Key=_file)
-                    else:
-                        pass
+                if self.source_type == SourceType.INCOMING:
+                    self._copy_from(_DEFAULT_BUCKET, files)
+                    _delete_keys(self.table_bucket, files)
+                elif self.source_type == SourceType.LEGACY:
+                    self._copy_from(
+                        "legacy-raw-data-qa", [_ for _ in files if _current_file(_)]
+                    )
+                else:
+                    pass
             else:
                 pass
         else:
@@ -239,6 +519,47 @@ class AthenaTable:
 
     
 
+    def _read_http_source(self):
+        """
+        This method reads the csv at source_path with pyarrow, keeping only the glue columns
+        and pinning their types with csv_column_types, like tsvgz_to_parquet;
+        pyarrow raises if a glue column is missing from the header
+        """
+        with urllib.request.urlopen(self.source_path) as source:
+            header = next(csv.reader([source.readline().decode("utf-8-sig")]))
+            return pyarrow.csv.read_csv(
+                source,
+                read_options=pyarrow.csv.ReadOptions(
+                    column_names=[_.lower() for _ in header]
+                ),
+                convert_options=pyarrow.csv.ConvertOptions(
+                    column_types=self.csv_column_types,
+                    include_columns=[_["Name"] for _ in self._columns_raw],
+                ),
+            )
+
+    def _copy_from(self, source_bucket, files):
+        """
+        This method copies files from source_bucket into the table location,
+        running up to _COPY_WORKERS copies concurrently
+
+        Each file is copied server side with a single CopyObject call; only objects
+        CopyObject rejects as too large (over 5GB) go through the multipart s3.copy.
+        """
+
+        def _copy_one(_file):
+            source = {"Bucket": source_bucket, "Key": _file}
+            key = f"{self.s3_root}/{self.table_schema}/{self.table_name}/{_file.split('/',1)[-1]}"
+            try:
+                _s3().copy_object(CopySource=source, Bucket=self.table_bucket, Key=key)
+            except ClientError as error:
+                if error.response["Error"]["Code"] != "InvalidRequest":
+                    raise
+                _s3().copy(source, Bucket=self.table_bucket, Key=key)
+
+        with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+            list(executor.map(_copy_one, files))
+
     def build_from_sql(self):
         """
         This method build a table defined via SQL
@@ -250,9 +571,9 @@ class AthenaTable:
         with open(self.source_path, "r") as sqlin:
             stmt = sqlin.read()
         self.purge()
-        with self.mgic_athena_engine().connect() as conn:
+        with self.mgic_athena_engine().begin() as conn:
             conn.execute(stmt)
-        self.set_glue_dictionary()
+        self.set_glue_dictionary(force=True)
         self.repair()
 
     def refresh_from_sql(self):
@@ -268,17 +589,17 @@ class AthenaTable:
         ), f"You are trying to build from SQL a table whose source_type != {SourceType.ATHENA}"
         with open(self.source_path, "r") as sqlin:
             stmt = sqlin.read()
-        with self.mgic_athena_engine().connect() as conn:
+        with self.mgic_athena_engine().begin() as conn:
             conn.execute(stmt)
-        self.set_glue_dictionary()
+        self.set_glue_dictionary(force=True)
 
     
 
 
 	def tsvgz_to_parquet(table_name, source_alias=None):
 	    """
-	    This function will load tsvgz files into memory one at a time
-	    and generate pandas.DataFrames
+	    This function will stream tsvgz files one block at a time
+	    and write each cast block as a row group of a parquet file
 	    """
 	    if source_alias is None:
 		    source_alias = table_name
@@ -293,20 +614,39 @@ class AthenaTable:
 	    source_table = Trapezi(
 		"staging", source_alias, AccessType.OVERWRITE, SourceType.PRODUCTION
 	    )
-	    newfiles = [_ for _ in source_table.listen() if _.__contains__(_today)]
+	    ymd = _today()
+	    newfiles = [_ for _ in source_table.listen() if ymd in _]
 	    if newfiles:
 		    tbl.empty()
 		for counter, source_path in enumerate(newfiles):
-		    write_parquet_path = f"s3://{tbl.table_bucket}/{tbl.s3_root}/{tbl.table_schema}/{tbl.table_name}/bulk_{str(counter).zfill(2)}.parquet"
-		    read_parquet_path = f"s3://{source_table.source_bucket}/{source_path}"
-		    frame = pandas.read_table(read_parquet_path)
-		    frame.columns = tbl.columns
-		    frame = tbl.castframe(frame)
-		    frame.to_parquet(
-		        write_parquet_path,
-		        coerce_timestamps="ms",
-		        allow_truncated_timestamps=True,
-		    )
+		    write_parquet_path = f"{tbl.table_bucket}/{tbl.s3_root}/{tbl.table_schema}/{tbl.table_name}/bulk_{str(counter).zfill(2)}.parquet"
+		    read_parquet_path = f"{source_table.source_bucket}/{source_path}"
+		    with _arrow_s3().open_input_stream(read_parquet_path) as source:
+		        reader = pyarrow.csv.open_csv(
+		            source,
+		            read_options=pyarrow.csv.ReadOptions(
+		                block_size=_CSV_BLOCK_SIZE,
+		                use_threads=True,
+		                skip_rows=1,
+		                column_names=tbl.columns,
+		            ),
+		            parse_options=pyarrow.csv.ParseOptions(delimiter="\t"),
+		            convert_options=pyarrow.csv.ConvertOptions(
+		                column_types=tbl.csv_column_types
+		            ),
+		        )
+		        with pyarrow.parquet.ParquetWriter(
+		            write_parquet_path,
+		            tbl._arrow_schema,
+		            filesystem=_arrow_s3(),
+		            compression="snappy",
+		        ) as writer:
+		            for batch in reader:
+		                writer.write_table(
+		                    _to_arrow_table(
+		                        tbl.castframe(batch.to_pandas()), tbl._arrow_schema
+		                    )
+		                )
 		tbl.repair()
 
 
@@ -334,12 +674,8 @@ class AthenaTable:
         """
         ans = None
         self.set_glue_dictionary()
-        if self.glue_definition:
-            ans = (
-                self.glue_definition["Table"]["StorageDescriptor"]["Location"]
-                .split(self.table_bucket)[1]
-                .split("/", 2)[2]
-            )
+        if self.glue_definition and self._location:
+            ans = self._location.split(self.table_bucket)[1].split("/", 2)[2]
         else:
             pass
         return ans
@@ -352,10 +688,7 @@ class AthenaTable:
         ans = []
         self.set_glue_dictionary()
         if self.glue_definition:
-            ans = [
-                _["Name"]
-                for _ in self.glue_definition["Table"]["StorageDescriptor"]["Columns"]
-            ]
+            ans = [_["Name"] for _ in self._columns_raw]
         else:
             pass
         return ans